@@ -3,7 +3,8 @@
 Task Automation CLI - A simple command-line task management tool
 
 This module provides a command-line interface for managing tasks with
-priorities, completion tracking, and persistent JSON storage.
+priorities, completion tracking, and persistent storage in an append-only
+JSON Lines log.
 
 Example:
     $ python task_cli.py add "Complete documentation" -p high
@@ -16,74 +17,390 @@ License: MIT
 
 import json
 import os
-import argparse
-from datetime import datetime
-from typing import List, Dict, Optional
+import sys
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, List, Dict, Optional
+
+# argparse and datetime are imported where they are used: most invocations
+# never build the parser, and list doesn't need timestamps.
+if TYPE_CHECKING:
+    import argparse
+
+
+def _json_encode(obj) -> bytes:
+    """Serialize obj to compact UTF-8 JSON bytes."""
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode(
+        'utf-8'
+    )
+
+
+# (encode, decode, decode error) for the stdlib json module
+_JSON_CODEC = (_json_encode, json.loads, ValueError)
+
+# Task files at least this big are read with orjson or msgspec when one is
+# installed. Importing them costs about 8 ms (orjson) and 22 ms (msgspec)
+# per run, while each decodes about 13 us/KB faster than json, so smaller
+# files are faster with the stdlib.
+_FAST_CODEC_MIN_BYTES = 2 * 1024 * 1024
+
+
+def _fast_codec():
+    """
+    Import the fastest available JSON codec.
+
+    Returns:
+        (encode, decode, decode error) for orjson, then msgspec, falling
+        back to the stdlib json codec if neither is installed.
+    """
+    try:
+        import orjson
+
+        return orjson.dumps, orjson.loads, orjson.JSONDecodeError
+    except ImportError:
+        pass
+    try:
+        import msgspec
+
+        return msgspec.json.encode, msgspec.json.decode, msgspec.DecodeError
+    except ImportError:
+        return _JSON_CODEC
+
+
+DEFAULT_DATA_FILE = "tasks.jsonl"
+LEGACY_DATA_FILE = "tasks.json"
+
+PRIORITIES = ("low", "medium", "high", "urgent")
+
+# Canonical string object for each priority, so every task shares one copy
+# instead of holding the string decoded from its own log record
+_PRIORITY_NAMES = {priority: sys.intern(priority) for priority in PRIORITIES}
+
+_PRIORITY_SYMBOLS = {
+    "urgent": "🚨",
+    "high": "🔴",
+    "medium": "🟡",
+    "low": "🟢"
+}
+
+# Indexed by 1 for completed tasks and 0 for active ones
+_STATUS_SYMBOLS = ("○", "✓")
+
+# "STATUS PRIORITY " row markers for each priority, indexed like
+# _STATUS_SYMBOLS, so format_task does a single lookup per row
+_ROW_MARKERS = {
+    priority: tuple(f"{status} {symbol} " for status in _STATUS_SYMBOLS)
+    for priority, symbol in _PRIORITY_SYMBOLS.items()
+}
+_UNKNOWN_ROW_MARKERS = tuple(f"{status} ⚪ " for status in _STATUS_SYMBOLS)
+
+# The log is compacted once it holds more than twice as many records as
+# there are live tasks, but never while it is shorter than this.
+_COMPACT_MIN_RECORDS = 64
 
 
 class TaskManager:
     """
-    Manages tasks with persistent JSON storage.
+    Manages tasks with persistent append-only log storage.
 
     This class handles task creation, retrieval, completion, and deletion,
-    with automatic persistence to a JSON file.
+    with automatic persistence to a JSON Lines file. Each modification
+    appends one operation record to the file instead of rewriting it; the
+    log is compacted when it grows well beyond the number of live tasks.
 
     Attributes:
-        data_file: Path to the JSON file for storing tasks
+        data_file: Path to the JSON Lines file for storing tasks
+        durable: Whether every write is fsynced
         tasks: List of task dictionaries
 
     Example:
-        >>> manager = TaskManager("my_tasks.json")
+        >>> manager = TaskManager("my_tasks.jsonl")
         >>> task = manager.add_task("Buy groceries", priority="high")
         >>> tasks = manager.list_tasks()
+        >>> with manager.batch():
+        ...     for line in lines:
+        ...         manager.add_task(line)
+        >>> manager.close()
     """
 
-    def __init__(self, data_file: str = "tasks.json"):
+    def __init__(self, data_file: str = DEFAULT_DATA_FILE, durable: bool = False):
         """
         Initialize TaskManager with a data file path.
 
         Args:
-            data_file: Path to the JSON file for storing tasks.
-                      Defaults to "tasks.json" in the current directory.
+            data_file: Path to the JSON Lines file for storing tasks.
+                      Defaults to "tasks.jsonl" in the current directory.
+            durable: If True, fsync the file after every write so each
+                    modification survives a power loss. Defaults to False;
+                    ``batch()`` blocks are always fsynced when they exit.
 
         Note:
             If the file doesn't exist, it will be created automatically
-            when the first task is added.
+            when the first task is added. It is then kept open for
+            appending until ``close()`` is called. A file in the old
+            format (a single JSON array) is still loaded and is converted
+            to the log format on the first modification. When the default
+            path is used and only an old "tasks.json" exists, its tasks are
+            first copied into a new "tasks.jsonl".
         """
+        if (
+            data_file == DEFAULT_DATA_FILE
+            and not os.path.exists(data_file)
+            and os.path.exists(LEGACY_DATA_FILE)
+        ):
+            _migrate_legacy_file(LEGACY_DATA_FILE, DEFAULT_DATA_FILE)
         self.data_file = data_file
+        self.durable = durable
+        self._fh = None
+        self._log_records = 0
+        self._legacy = False
+        self._torn_tail = False
+        self._encode, self._decode, self._DecodeError = _JSON_CODEC
         self.tasks: List[Dict] = self._load_tasks()
+        self._id_index: Dict[int, int] = {}
+        self._reindex()
+        self._next_id = max(self._id_index, default=0) + 1
+        self._in_batch = False
+        self._batch_time: Optional[str] = None
+        self._pending: List[bytes] = []
+
+    def close(self) -> None:
+        """
+        Close the data file handle kept open for appending.
+
+        Safe to call more than once; a later modification reopens the file.
+        """
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def __enter__(self) -> "TaskManager":
+        """Return the TaskManager itself for use in a ``with`` block."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Close the data file when the ``with`` block exits."""
+        self.close()
+
+    def __del__(self):
+        """Close the data file when the TaskManager is garbage collected."""
+        self.close()
 
     def _load_tasks(self) -> List[Dict]:
         """
-        Load tasks from JSON file.
+        Load tasks by replaying the operation log.
 
         Returns:
             List of task dictionaries. Returns empty list if file doesn't
-            exist or contains invalid JSON.
+            exist or can't be read. Lines that aren't valid records (e.g. a
+            write torn by a crash) are skipped. In a file in the old format,
+            tasks repeating an earlier task's ID are given new IDs.
 
         Note:
             This is a private method called during initialization.
         """
-        if os.path.exists(self.data_file):
+        if not os.path.exists(self.data_file):
+            return []
+        try:
+            with open(self.data_file, 'rb') as f:
+                if os.fstat(f.fileno()).st_size >= _FAST_CODEC_MIN_BYTES:
+                    self._encode, self._decode, self._DecodeError = _fast_codec()
+                if f.peek().lstrip().startswith(b'['):
+                    # Rewrite the whole file on the first change, even if
+                    # it can't be decoded, so records never land after it
+                    self._legacy = True
+                    try:
+                        tasks = self._decode(f.read())
+                    except self._DecodeError:
+                        return []
+                    # The old len(tasks) + 1 rule could repeat an ID after a
+                    # delete; later copies get fresh IDs so none is lost
+                    next_id = max((task["id"] for task in tasks), default=0) + 1
+                    seen = set()
+                    for task in tasks:
+                        priority = task.get("priority")
+                        task["priority"] = _PRIORITY_NAMES.get(priority, priority)
+                        if task["id"] in seen:
+                            task["id"] = next_id
+                            next_id += 1
+                        seen.add(task["id"])
+                    return tasks
+                return self._replay(f)
+        except IOError:
+            return []
+
+    def _replay(self, lines) -> List[Dict]:
+        """
+        Rebuild the task list from operation records.
+
+        Args:
+            lines: Iterable of encoded records, one per item. Reading
+                   straight from the file object keeps only one line in
+                   memory at a time.
+
+        Returns:
+            List of live task dictionaries in creation order.
+
+        Note:
+            If the last line has no trailing newline (a write torn by a
+            crash), the next append starts a new line first so the new
+            record isn't glued onto the fragment.
+        """
+        tasks: Dict[int, Dict] = {}
+        for line in lines:
+            self._torn_tail = not line.endswith(b"\n")
+            if not line.strip():
+                continue
             try:
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError):
-                return []
-        return []
+                record = self._decode(line)
+                op = record["op"]
+                if op == "add":
+                    task = record["task"]
+                    priority = task["priority"]
+                    task["priority"] = _PRIORITY_NAMES.get(priority, priority)
+                    tasks[task["id"]] = task
+                elif op == "complete":
+                    task = tasks.get(record["id"])
+                    if task is not None:
+                        task["completed"] = True
+                        task["completed_at"] = record["completed_at"]
+                elif op == "delete":
+                    tasks.pop(record["id"], None)
+            except (self._DecodeError, KeyError, TypeError):
+                continue
+            self._log_records += 1
+        return list(tasks.values())
+
+    def _reindex(self) -> None:
+        """
+        Rebuild the mapping from task ID to position in the tasks list.
 
-    def _save_tasks(self) -> None:
+        Note:
+            Relies on IDs being unique, which ``_load_tasks`` ensures even
+            for old-format files that repeated an ID.
         """
-        Save tasks to JSON file.
+        self._id_index = {task["id"]: i for i, task in enumerate(self.tasks)}
 
-        Writes the current tasks list to the JSON file with UTF-8 encoding
-        and pretty-printing (2-space indentation).
+    def _now(self) -> str:
+        """Return the current time as an ISO string, fixed for a batch."""
+        if self._batch_time is not None:
+            return self._batch_time
+        from datetime import datetime
+        return datetime.now().isoformat()
+
+    def _log(self, record: Dict) -> None:
+        """
+        Record a modification in the operation log.
+
+        Args:
+            record: Operation record, e.g. ``{"op": "delete", "id": 3}``
 
         Note:
-            This is a private method called after any task modification.
+            Inside a ``batch()`` block the record is only queued; it is
+            written when the block exits.
+        """
+        self._pending.append(self._encode(record) + b"\n")
+        if not self._in_batch:
+            self._flush()
+
+    def _flush(self, sync: bool = False) -> None:
         """
-        with open(self.data_file, 'w', encoding='utf-8') as f:
-            json.dump(self.tasks, f, indent=2, ensure_ascii=False)
+        Append queued records to the log, compacting it if needed.
+
+        The records are written through a handle that stays open between
+        calls and are flushed before returning, so other readers see them.
+
+        Args:
+            sync: If True, fsync the file so the data is on disk when this
+                  method returns.
+        """
+        if not self._pending:
+            return
+        sync = sync or self.durable
+        records, self._pending = self._pending, []
+        total = self._log_records + len(records)
+        if self._legacy or total > max(_COMPACT_MIN_RECORDS, 2 * len(self.tasks)):
+            self._save_tasks(sync)
+            return
+        if self._fh is None:
+            self._fh = open(self.data_file, 'ab')
+        if self._torn_tail:
+            records.insert(0, b"\n")
+            self._torn_tail = False
+        self._fh.write(b"".join(records))
+        self._fh.flush()
+        if sync:
+            os.fsync(self._fh.fileno())
+        self._log_records = total
+
+    def _save_tasks(self, sync: bool = False) -> None:
+        """
+        Compact the log by rewriting it with one record per live task.
+
+        The new log is written to a temporary file next to the data file
+        and then renamed over it, so a crash leaves either the old or the
+        new log in place, never a truncated one.
+
+        Args:
+            sync: If True, fsync the file before renaming it so the data is
+                  on disk when this method returns.
+
+        Note:
+            This is a private method called when the log has grown too
+            long, or when a file in the old format is first modified.
+        """
+        # The append handle would keep pointing at the replaced file
+        self.close()
+        tmp_file = self.data_file + ".tmp"
+        try:
+            with open(tmp_file, 'wb') as f:
+                f.write(b"".join(
+                    self._encode({"op": "add", "task": task}) + b"\n"
+                    for task in self.tasks
+                ))
+                if sync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_file, self.data_file)
+        except BaseException:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+            raise
+        self._log_records = len(self.tasks)
+        self._legacy = False
+        self._torn_tail = False
+
+    @contextmanager
+    def batch(self):
+        """
+        Group several modifications into a single write.
+
+        Every modification made inside the block updates the in-memory task
+        list and queues its log record; the records are written (and
+        fsynced) in one go when the block exits. Nested ``batch()`` blocks
+        are merged into the outermost one. All timestamps recorded inside
+        the block are the time the block was entered.
+
+        Yields:
+            The TaskManager itself.
+
+        Example:
+            >>> with manager.batch():
+            ...     manager.add_task("Task 1")
+            ...     manager.add_task("Task 2")
+        """
+        if self._in_batch:
+            yield self
+            return
+        from datetime import datetime
+        self._in_batch = True
+        self._batch_time = datetime.now().isoformat()
+        try:
+            yield self
+        finally:
+            self._in_batch = False
+            self._batch_time = None
+            self._flush(sync=True)
 
     def add_task(self, description: str, priority: str = "medium") -> Dict:
         """
@@ -96,7 +413,8 @@ class TaskManager:
 
         Returns:
             Dictionary containing the created task with fields:
-            - id: Unique task identifier
+            - id: Unique task identifier (one more than the highest
+              existing ID)
             - description: Task description
             - priority: Priority level
             - completed: Completion status (always False for new tasks)
@@ -109,15 +427,17 @@ class TaskManager:
             1
         """
         task = {
-            "id": len(self.tasks) + 1,
+            "id": self._next_id,
             "description": description,
-            "priority": priority,
+            "priority": _PRIORITY_NAMES.get(priority, priority),
             "completed": False,
-            "created_at": datetime.now().isoformat(),
+            "created_at": self._now(),
             "completed_at": None
         }
+        self._next_id += 1
+        self._id_index[task["id"]] = len(self.tasks)
         self.tasks.append(task)
-        self._save_tasks()
+        self._log({"op": "add", "task": task})
         return task
 
     def list_tasks(self, show_completed: bool = False) -> List[Dict]:
@@ -149,20 +469,28 @@ class TaskManager:
         Returns:
             The completed task dictionary if found, None otherwise.
             The task will have its 'completed' field set to True and
-            'completed_at' set to the current timestamp.
+            'completed_at' set to the current timestamp. Completing an
+            already completed task returns it unchanged and writes nothing.
 
         Example:
             >>> task = manager.complete_task(1)
             >>> if task:
             ...     print(f"Completed: {task['description']}")
         """
-        for task in self.tasks:
-            if task["id"] == task_id:
-                task["completed"] = True
-                task["completed_at"] = datetime.now().isoformat()
-                self._save_tasks()
-                return task
-        return None
+        idx = self._id_index.get(task_id)
+        if idx is None:
+            return None
+        task = self.tasks[idx]
+        if task["completed"]:
+            return task
+        task["completed"] = True
+        task["completed_at"] = self._now()
+        self._log({
+            "op": "complete",
+            "id": task_id,
+            "completed_at": task["completed_at"]
+        })
+        return task
 
     def delete_task(self, task_id: int) -> bool:
         """
@@ -176,7 +504,7 @@ class TaskManager:
 
         Warning:
             This operation is irreversible. The task will be permanently
-            removed from the JSON file.
+            removed from the task file.
 
         Example:
             >>> if manager.delete_task(1):
@@ -184,12 +512,15 @@ class TaskManager:
             ... else:
             ...     print("Task not found")
         """
-        initial_length = len(self.tasks)
-        self.tasks = [task for task in self.tasks if task["id"] != task_id]
-        if len(self.tasks) < initial_length:
-            self._save_tasks()
-            return True
-        return False
+        idx = self._id_index.pop(task_id, None)
+        if idx is None:
+            return False
+        del self.tasks[idx]
+        # Only the tasks after the removed one have moved
+        for i in range(idx, len(self.tasks)):
+            self._id_index[self.tasks[i]["id"]] = i
+        self._log({"op": "delete", "id": task_id})
+        return True
 
 
 def format_task(task: Dict) -> str:
@@ -220,36 +551,37 @@ def format_task(task: Dict) -> str:
         >>> print(format_task(task))
         [1] ○ 🔴 Test
     """
-    status = "✓" if task["completed"] else "○"
-    priority_symbols = {
-        "urgent": "🚨",
-        "high": "🔴",
-        "medium": "🟡",
-        "low": "🟢"
-    }
-    priority = priority_symbols.get(task["priority"], "⚪")
-    return f"[{task['id']}] {status} {priority} {task['description']}"
+    markers = _ROW_MARKERS.get(task["priority"], _UNKNOWN_ROW_MARKERS)
+    status = 1 if task["completed"] else 0
+    return f"[{task['id']}] {markers[status]}{task['description']}"
 
 
-def main():
+def _migrate_legacy_file(legacy_file: str, data_file: str) -> None:
     """
-    Main CLI entry point - parse arguments and execute commands.
+    Convert an old-format task file into a log at a new path.
 
-    This function sets up the argument parser with subcommands for:
-    - add: Add a new task
-    - list: List tasks
-    - complete: Mark a task as completed
-    - delete: Delete a task
+    Args:
+        legacy_file: Path of the file holding a single JSON array of tasks
+        data_file: Path of the JSON Lines log to create
 
-    The function parses command-line arguments, initializes TaskManager,
-    and executes the requested command.
+    Note:
+        The old file is left unchanged, so tools that read it as a JSON
+        array keep working on the tasks as they were at migration time.
+    """
+    manager = TaskManager(legacy_file)
+    manager.data_file = data_file
+    manager._save_tasks(sync=True)
 
-    Example:
-        $ python task_cli.py add "My task" -p high
-        $ python task_cli.py list
-        $ python task_cli.py complete 1
-        $ python task_cli.py delete 2
+
+def _build_parser() -> "argparse.ArgumentParser":
+    """
+    Build the argument parser with one subcommand per CLI command.
+
+    Returns:
+        The configured ArgumentParser.
     """
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="Task Automation CLI - Manage your tasks from the command line"
     )
@@ -260,7 +592,7 @@ def main():
     add_parser.add_argument("description", help="Task description")
     add_parser.add_argument(
         "-p", "--priority",
-        choices=["low", "medium", "high", "urgent"],
+        choices=PRIORITIES,
         default="medium",
         help="Task priority (default: medium)"
     )
@@ -281,13 +613,86 @@ def main():
     delete_parser = subparsers.add_parser("delete", help="Delete a task")
     delete_parser.add_argument("task_id", type=int, help="Task ID to delete")
 
-    args = parser.parse_args()
+    return parser
+
+
+def _parse_fast(argv: List[str]) -> Optional[SimpleNamespace]:
+    """
+    Parse the common command forms without building the argparse parser.
+
+    Args:
+        argv: Command-line arguments, without the program name
+
+    Returns:
+        A namespace with the same attributes argparse would produce, or
+        None if argv isn't one of the plain forms below. Help requests,
+        errors and less common spellings are left to argparse.
+
+        - add DESCRIPTION [-p|--priority PRIORITY]
+        - list [-a|--all]
+        - complete TASK_ID
+        - delete TASK_ID
+    """
+    if not argv:
+        return None
+    command, rest = argv[0], argv[1:]
+
+    if command == "add":
+        if not rest or rest[0].startswith("-"):
+            return None
+        if len(rest) == 1:
+            return SimpleNamespace(
+                command=command, description=rest[0], priority="medium"
+            )
+        if len(rest) == 3 and rest[1] in ("-p", "--priority"):
+            if rest[2] in PRIORITIES:
+                return SimpleNamespace(
+                    command=command, description=rest[0], priority=rest[2]
+                )
+
+    elif command == "list":
+        if not rest:
+            return SimpleNamespace(command=command, all=False)
+        if len(rest) == 1 and rest[0] in ("-a", "--all"):
+            return SimpleNamespace(command=command, all=True)
+
+    elif command in ("complete", "delete"):
+        if len(rest) == 1 and rest[0].isascii() and rest[0].isdigit():
+            return SimpleNamespace(command=command, task_id=int(rest[0]))
+
+    return None
+
 
-    if not args.command:
-        parser.print_help()
-        return
+def main():
+    """
+    Main CLI entry point - parse arguments and execute commands.
 
-    # Initialize TaskManager
+    Supported subcommands:
+    - add: Add a new task
+    - list: List tasks
+    - complete: Mark a task as completed
+    - delete: Delete a task
+
+    The function parses command-line arguments, initializes TaskManager,
+    and executes the requested command. Plain invocations are parsed
+    directly; the argparse parser is only built for help output, errors,
+    and less common argument spellings.
+
+    Example:
+        $ python task_cli.py add "My task" -p high
+        $ python task_cli.py list
+        $ python task_cli.py complete 1
+        $ python task_cli.py delete 2
+    """
+    args = _parse_fast(sys.argv[1:])
+    if args is None:
+        parser = _build_parser()
+        args = parser.parse_args()
+        if not args.command:
+            parser.print_help()
+            return
+
+    # Initialize TaskManager (converts a pre-log tasks.json on first run)
     manager = TaskManager()
 
     # Execute commands
@@ -300,12 +705,14 @@ def main():
         if not tasks:
             print("No tasks found.")
         else:
-            print(f"\n{'All Tasks' if args.all else 'Active Tasks'}:")
-            print("-" * 50)
-            for task in tasks:
-                print(format_task(task))
-            print("-" * 50)
-            print(f"Total: {len(tasks)} task(s)")
+            # Build the whole listing and write it in one call
+            separator = "-" * 50
+            lines = [f"\n{'All Tasks' if args.all else 'Active Tasks'}:", separator]
+            lines.extend(format_task(task) for task in tasks)
+            lines.append(separator)
+            lines.append(f"Total: {len(tasks)} task(s)")
+            lines.append("")
+            sys.stdout.write("\n".join(lines))
 
     elif args.command == "complete":
         task = manager.complete_task(args.task_id)
@@ -12,7 +12,13 @@ import sys
 # Add parent directory to path to import task_cli
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from task_cli import TaskManager, format_task
+from task_cli import (
+    TaskManager,
+    format_task,
+    _build_parser,
+    _migrate_legacy_file,
+    _parse_fast,
+)
 
 
 @pytest.fixture
@@ -98,6 +104,16 @@ class TestTaskManager:
         assert completed_task["completed"] is True
         assert completed_task["completed_at"] is not None
 
+    def test_complete_task_twice(self, task_manager, temp_task_file):
+        """Test that completing a completed task changes nothing"""
+        task_manager.add_task("Task to complete")
+        first = task_manager.complete_task(1)["completed_at"]
+        second = task_manager.complete_task(1)["completed_at"]
+
+        assert second == first
+        with open(temp_task_file, encoding='utf-8') as f:
+            assert len(f.readlines()) == 2
+
     def test_complete_nonexistent_task(self, task_manager):
         """Test completing a task that doesn't exist"""
         result = task_manager.complete_task(999)
@@ -113,6 +129,43 @@ class TestTaskManager:
         assert len(task_manager.tasks) == 1
         assert task_manager.tasks[0]["id"] == 2
 
+    def test_delete_keeps_order(self, task_manager):
+        """Test that deleting a task keeps the others in creation order"""
+        for i in range(5):
+            task_manager.add_task(f"Task {i + 1}")
+        task_manager.delete_task(2)
+        task_manager.delete_task(4)
+
+        assert [task["id"] for task in task_manager.tasks] == [1, 3, 5]
+        assert task_manager.complete_task(5)["description"] == "Task 5"
+
+    def test_ids_unique_after_delete(self, task_manager):
+        """Test that new tasks don't reuse the ID of a live task"""
+        task_manager.add_task("Task 1")
+        task_manager.add_task("Task 2")
+        task_manager.delete_task(1)
+        task3 = task_manager.add_task("Task 3")
+
+        assert task3["id"] == 3
+        assert task_manager.complete_task(2)["description"] == "Task 2"
+        assert task_manager.complete_task(3)["description"] == "Task 3"
+
+    def test_legacy_duplicate_ids_indexed(self, temp_task_file):
+        """Test that every task from an old file with repeated IDs is reachable"""
+        legacy_tasks = [
+            {"id": task_id, "description": description, "completed": False}
+            for task_id, description in [(1, "a"), (3, "c"), (3, "d")]
+        ]
+        with open(temp_task_file, 'w') as f:
+            json.dump(legacy_tasks, f)
+
+        manager = TaskManager(data_file=temp_task_file)
+        for task in manager.list_tasks():
+            assert manager.complete_task(task["id"]) is task
+        for task in list(manager.tasks):
+            assert manager.delete_task(task["id"]) is True
+        assert manager.tasks == []
+
     def test_delete_nonexistent_task(self, task_manager):
         """Test deleting a task that doesn't exist"""
         result = task_manager.delete_task(999)
@@ -144,6 +197,135 @@ class TestTaskManager:
         assert medium_task["priority"] == "medium"
         assert low_task["priority"] == "low"
 
+    def test_priority_strings_shared(self, temp_task_file):
+        """Test that loaded tasks share one string object per priority"""
+        manager = TaskManager(data_file=temp_task_file)
+        manager.add_task("Task 1", priority="".join(["hi", "gh"]))
+        manager.add_task("Task 2", priority="high")
+
+        reloaded = TaskManager(data_file=temp_task_file)
+        assert reloaded.tasks[0]["priority"] is reloaded.tasks[1]["priority"]
+        assert manager.tasks[0]["priority"] is manager.tasks[1]["priority"]
+
+    def test_batch_defers_save(self, temp_task_file):
+        """Test that a batch only writes the file when it exits"""
+        manager = TaskManager(data_file=temp_task_file)
+        with manager.batch():
+            manager.add_task("Batched task 1")
+            manager.add_task("Batched task 2")
+            manager.complete_task(1)
+            assert TaskManager(data_file=temp_task_file).tasks == []
+
+        reloaded = TaskManager(data_file=temp_task_file)
+        assert len(reloaded.tasks) == 2
+        assert reloaded.tasks[0]["completed"] is True
+
+    def test_batch_shares_timestamp(self, task_manager):
+        """Test that tasks added in one batch share a creation time"""
+        with task_manager.batch():
+            task1 = task_manager.add_task("Task 1")
+            task2 = task_manager.add_task("Task 2")
+        task3 = task_manager.add_task("Task 3")
+
+        assert task1["created_at"] == task2["created_at"]
+        assert task3["created_at"] >= task1["created_at"]
+
+    def test_nested_batch(self, temp_task_file):
+        """Test that nested batches are saved by the outermost one"""
+        manager = TaskManager(data_file=temp_task_file)
+        with manager.batch():
+            with manager.batch():
+                manager.add_task("Inner task")
+            assert TaskManager(data_file=temp_task_file).tasks == []
+
+        assert len(TaskManager(data_file=temp_task_file).tasks) == 1
+
+    def test_modifications_append_to_log(self, temp_task_file):
+        """Test that each modification appends one record to the log"""
+        manager = TaskManager(data_file=temp_task_file)
+        manager.add_task("Task 1")
+        manager.add_task("Task 2")
+        manager.complete_task(1)
+        manager.delete_task(2)
+
+        with open(temp_task_file, encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        ops = [record["op"] for record in records]
+        assert ops == ["add", "add", "complete", "delete"]
+
+        reloaded = TaskManager(data_file=temp_task_file)
+        assert len(reloaded.tasks) == 1
+        assert reloaded.tasks[0]["id"] == 1
+        assert reloaded.tasks[0]["completed"] is True
+
+    def test_log_compaction(self, temp_task_file):
+        """Test that a long log is compacted to the live tasks"""
+        manager = TaskManager(data_file=temp_task_file)
+        for i in range(70):
+            manager.add_task(f"Task {i + 1}")
+        for task_id in range(1, 61):
+            manager.delete_task(task_id)
+
+        with open(temp_task_file, encoding='utf-8') as f:
+            assert len(f.readlines()) < 130
+
+        reloaded = TaskManager(data_file=temp_task_file)
+        assert [task["id"] for task in reloaded.tasks] == list(range(61, 71))
+        assert not os.path.exists(temp_task_file + ".tmp")
+
+    def test_append_handle_reused(self, temp_task_file):
+        """Test that the data file stays open between modifications"""
+        with TaskManager(data_file=temp_task_file) as manager:
+            manager.add_task("Task 1")
+            handle = manager._fh
+            manager.add_task("Task 2")
+            assert manager._fh is handle
+            assert len(TaskManager(data_file=temp_task_file).tasks) == 2
+
+        assert handle.closed
+        assert manager._fh is None
+
+    def test_append_after_compaction(self, temp_task_file):
+        """Test that appends after a compaction go to the new file"""
+        manager = TaskManager(data_file=temp_task_file)
+        for i in range(70):
+            manager.add_task(f"Task {i + 1}")
+        for task_id in range(1, 61):
+            manager.delete_task(task_id)
+        manager.add_task("After compaction")
+        manager.close()
+
+        reloaded = TaskManager(data_file=temp_task_file)
+        assert len(reloaded.tasks) == 11
+        assert reloaded.tasks[-1]["description"] == "After compaction"
+
+    def test_large_file_codec(self, temp_task_file, monkeypatch):
+        """Test reading and compacting with the codec used for large files"""
+        manager = TaskManager(data_file=temp_task_file)
+        manager.add_task("Task 1", priority="high")
+        manager.add_task("Task 2")
+        manager.close()
+
+        monkeypatch.setattr("task_cli._FAST_CODEC_MIN_BYTES", 0)
+        manager = TaskManager(data_file=temp_task_file)
+        manager.complete_task(1)
+        manager._save_tasks()
+        manager.close()
+
+        reloaded = TaskManager(data_file=temp_task_file)
+        descriptions = [task["description"] for task in reloaded.tasks]
+        assert descriptions == ["Task 1", "Task 2"]
+        assert reloaded.tasks[0]["completed"] is True
+
+    def test_durable_writes(self, temp_task_file):
+        """Test that a durable manager persists every modification"""
+        manager = TaskManager(data_file=temp_task_file, durable=True)
+        manager.add_task("Durable task")
+        manager.complete_task(1)
+
+        reloaded = TaskManager(data_file=temp_task_file)
+        assert reloaded.tasks[0]["completed"] is True
+
 
 class TestFormatTask:
     """Test cases for format_task function"""
@@ -188,6 +370,72 @@ class TestFormatTask:
         assert "🟡" in format_task(medium_task)
         assert "🟢" in format_task(low_task)
 
+    def test_format_task_exact(self):
+        """Test the exact layout for known and unknown priorities"""
+        task = {
+            "id": 7,
+            "description": "Ship it",
+            "priority": "urgent",
+            "completed": True,
+        }
+        unknown = {
+            "id": 8,
+            "description": "Odd",
+            "priority": "someday",
+            "completed": False,
+        }
+
+        assert format_task(task) == "[7] ✓ 🚨 Ship it"
+        assert format_task(unknown) == "[8] ○ ⚪ Odd"
+
+    def test_format_task_non_bool_completed(self):
+        """Test that any falsy or truthy completed value is accepted"""
+        active = {
+            "id": 1,
+            "description": "Hand-edited",
+            "priority": "low",
+            "completed": None,
+        }
+        done = {"id": 2, "description": "Legacy", "priority": "low", "completed": "yes"}
+
+        assert format_task(active) == "[1] ○ 🟢 Hand-edited"
+        assert format_task(done) == "[2] ✓ 🟢 Legacy"
+
+
+class TestArgumentParsing:
+    """Test cases for the fast command-line parser"""
+
+    @pytest.mark.parametrize("argv", [
+        ["add", "My task"],
+        ["add", "My task", "-p", "high"],
+        ["add", "My task", "--priority", "urgent"],
+        ["list"],
+        ["list", "-a"],
+        ["list", "--all"],
+        ["complete", "3"],
+        ["delete", "12"],
+    ])
+    def test_matches_argparse(self, argv):
+        """Test that plain invocations parse the same as with argparse"""
+        fast = _parse_fast(argv)
+        assert fast is not None
+        assert vars(fast) == vars(_build_parser().parse_args(argv))
+
+    @pytest.mark.parametrize("argv", [
+        [],
+        ["-h"],
+        ["add"],
+        ["add", "My task", "-p", "critical"],
+        ["add", "-p", "high", "My task"],
+        ["list", "--help"],
+        ["complete", "one"],
+        ["delete", "1", "2"],
+        ["unknown"],
+    ])
+    def test_defers_to_argparse(self, argv):
+        """Test that help, errors and unusual forms are left to argparse"""
+        assert _parse_fast(argv) is None
+
 
 class TestEdgeCases:
     """Test edge cases and error handling"""
@@ -201,6 +449,132 @@ class TestEdgeCases:
         manager = TaskManager(data_file=temp_task_file)
         assert manager.tasks == []
 
+    def test_migrate_legacy_file(self, temp_task_file):
+        """Test converting an old-format file into a log at a new path"""
+        legacy_task = {
+            "id": 1,
+            "description": "Legacy task",
+            "priority": "low",
+            "completed": False,
+            "created_at": "2026-02-01T23:00:00.123456",
+            "completed_at": None
+        }
+        with open(temp_task_file, 'w') as f:
+            json.dump([legacy_task], f)
+        log_file = temp_task_file + "l"
+
+        try:
+            _migrate_legacy_file(temp_task_file, log_file)
+            with open(temp_task_file) as f:
+                assert json.load(f) == [legacy_task]
+            with open(log_file, encoding='utf-8') as f:
+                assert [json.loads(line)["op"] for line in f] == ["add"]
+            assert TaskManager(data_file=log_file).tasks == [legacy_task]
+        finally:
+            if os.path.exists(log_file):
+                os.remove(log_file)
+
+    def test_migrate_legacy_duplicate_ids(self, temp_task_file):
+        """Test that tasks sharing an ID in an old-format file all survive"""
+        legacy_tasks = [
+            {
+                "id": task_id,
+                "description": description,
+                "priority": "medium",
+                "completed": False,
+                "created_at": "2026-02-01T23:00:00.123456",
+                "completed_at": None
+            }
+            for task_id, description in [(1, "a"), (3, "c"), (3, "d")]
+        ]
+        with open(temp_task_file, 'w') as f:
+            json.dump(legacy_tasks, f, indent=2)
+        log_file = temp_task_file + "l"
+
+        try:
+            _migrate_legacy_file(temp_task_file, log_file)
+            reloaded = TaskManager(data_file=log_file)
+            assert [(task["id"], task["description"]) for task in reloaded.tasks] == [
+                (1, "a"),
+                (3, "c"),
+                (4, "d"),
+            ]
+        finally:
+            if os.path.exists(log_file):
+                os.remove(log_file)
+
+    def test_default_path_migrates_legacy_file(self, tmp_path, monkeypatch):
+        """Test that TaskManager() picks up an old tasks.json next to it"""
+        monkeypatch.chdir(tmp_path)
+        legacy_task = {
+            "id": 1,
+            "description": "Legacy task",
+            "priority": "low",
+            "completed": False,
+            "created_at": "2026-02-01T23:00:00.123456",
+            "completed_at": None
+        }
+        (tmp_path / "tasks.json").write_text(json.dumps([legacy_task]))
+
+        manager = TaskManager()
+        assert manager.tasks == [legacy_task]
+        assert (tmp_path / "tasks.jsonl").exists()
+        assert json.loads((tmp_path / "tasks.json").read_text()) == [legacy_task]
+
+    def test_truncated_legacy_json_array(self, temp_task_file):
+        """Test that a truncated old-format file is replaced on first change"""
+        with open(temp_task_file, 'w') as f:
+            f.write('[\n  {\n    "id": 1,\n    "descr')
+
+        manager = TaskManager(data_file=temp_task_file)
+        assert manager.tasks == []
+        manager.add_task("New task 1")
+        manager.add_task("New task 2")
+        manager.close()
+
+        reloaded = TaskManager(data_file=temp_task_file)
+        assert [task["id"] for task in reloaded.tasks] == [1, 2]
+
+    def test_skip_torn_log_record(self, temp_task_file):
+        """Test that a partially written record is ignored"""
+        manager = TaskManager(data_file=temp_task_file)
+        manager.add_task("Complete record")
+        with open(temp_task_file, 'a') as f:
+            f.write('{"op": "add", "task": {"id": 2')
+
+        manager = TaskManager(data_file=temp_task_file)
+        assert len(manager.tasks) == 1
+        assert manager.tasks[0]["description"] == "Complete record"
+
+        manager.add_task("After crash")
+        manager.close()
+        reloaded = TaskManager(data_file=temp_task_file)
+        assert [task["description"] for task in reloaded.tasks] == [
+            "Complete record",
+            "After crash",
+        ]
+
+    def test_load_legacy_json_array(self, temp_task_file):
+        """Test loading and converting a file in the old JSON array format"""
+        legacy_task = {
+            "id": 1,
+            "description": "Legacy task",
+            "priority": "low",
+            "completed": False,
+            "created_at": "2026-02-01T23:00:00.123456",
+            "completed_at": None
+        }
+        with open(temp_task_file, 'w') as f:
+            json.dump([legacy_task], f, indent=2)
+
+        manager = TaskManager(data_file=temp_task_file)
+        assert manager.tasks == [legacy_task]
+
+        manager.add_task("New task")
+        with open(temp_task_file, encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        assert [record["task"]["id"] for record in records] == [1, 2]
+
     def test_empty_task_description(self, task_manager):
         """Test adding task with empty description"""
         task = task_manager.add_task("")